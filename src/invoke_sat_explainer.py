@@ -4,6 +4,6 @@ cnf = load_dimacs("out.cnf")
 assumptions = [81, 97, 15]        # customer selections
 core_hint_literals = [15] # optional hints from core dump
 
-report = explain_with_mus(cnf, assumptions, core_hint_literals=core_hint_literals)
+report = explain_with_mus(cnf, assumptions, core_hint_literals=core_hint_literals, persistent_cache=True)
 import json
 print(json.dumps(report, indent=2))
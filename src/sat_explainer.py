@@ -1,5 +1,29 @@
-from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Tuple, Set
+import hashlib
+import itertools
+import json
+import mmap
+import multiprocessing
+import os
+import random
+import re
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import InitVar, dataclass, field
+from functools import cached_property
+from typing import List, Dict, Optional, Sequence, Tuple, Set
+
+try:
+    # Optional: bulk DIMACS parsing and flat clause arrays
+    import numpy as np
+except ImportError:
+    np = None
+try:
+    # Optional accelerator for Boolean UNSAT checks; pure-Python DPLL is used without it
+    from numba import njit
+except ImportError:
+    njit = None
+
+_clause_ids = itertools.count()
 
 @dataclass
 class RuleMeta:
@@ -11,15 +35,186 @@ class Clause:
     lits: List[int]
     rule_id: str = ""
     note: str = ""
-    def __post_init__(self):
-        # Normalize: unique literals, sorted for stable output
-        self.lits = sorted(set(self.lits), key=lambda x: (abs(x), x))
+    # Stable identity for caching; assigned on first CNF construction, never copied by dataclasses.replace
+    clause_id: int = field(default=-1, init=False, repr=False, compare=False)
+    # (pos_mask, neg_mask) variable bitmasks, built on first use by clause_status_masks
+    _masks: Optional[Tuple[int, int]] = field(default=None, init=False, repr=False, compare=False)
+    # Callers that already hold unique literals sorted by (abs, sign) skip normalization
+    _normalized: InitVar[bool] = False
+    def __post_init__(self, _normalized: bool):
+        # Normalize: unique literals, sorted for stable output (by abs, negative first).
+        # The second sort is stable on the first, so both run with C-level keys.
+        if not _normalized:
+            self.lits = sorted(sorted(set(self.lits)), key=abs) if len(self.lits) > 1 else list(self.lits)
+
+    @property
+    def key(self) -> Tuple[int, ...]:
+        """Normalized literal tuple; equal keys mean the same clause."""
+        return tuple(self.lits)
+
+    @property
+    def is_tautology(self) -> bool:
+        # Literals are unique, so a repeated variable means both signs occur
+        return len({abs(l) for l in self.lits}) < len(self.lits)
+
+    @property
+    def masks(self) -> Tuple[int, int]:
+        """(pos_mask, neg_mask): bit v is set when v / -v is a literal.
+
+        Built lazily, since each mask takes as many bits as the clause's largest variable.
+        """
+        if self._masks is None:
+            pos_mask = 0
+            neg_mask = 0
+            for lit in self.lits:
+                if lit > 0:
+                    pos_mask |= 1 << lit
+                else:
+                    neg_mask |= 1 << -lit
+            self._masks = (pos_mask, neg_mask)
+        return self._masks
+
+def _assign_clause_ids(clauses: Sequence[Clause]):
+    for cl in clauses:
+        if cl.clause_id < 0:
+            cl.clause_id = next(_clause_ids)
 
 @dataclass
 class CNF:
     num_vars: int
-    clauses: List[Clause]
+    # Stored as a tuple: watches, clause arrays and memoized checks are derived from it,
+    # so build a new CNF (or call preprocess) instead of changing it in place
+    clauses: Sequence[Clause]
     rules: Dict[str, RuleMeta] = field(default_factory=dict)
+    # Clauses dropped while loading, for observability
+    duplicates_removed: int = 0
+    tautologies_removed: int = 0
+    subsumed_removed: int = 0
+    # clause_id of a clause removed by preprocess() -> the clause that subsumed it
+    subsumed_by: Dict[int, Clause] = field(default_factory=dict, repr=False, compare=False)
+    # Reverse of subsumed_by: subsumer clause_id -> clauses it replaced
+    _subsumed: Dict[int, List[Clause]] = field(default_factory=dict, repr=False, compare=False)
+    # Two-watched-literal state: literal -> clause indices, clause index -> [w0, w1] into clause.lits
+    watches: Dict[int, List[int]] = field(init=False, repr=False, compare=False)
+    watch_idx: List[List[int]] = field(init=False, repr=False, compare=False)
+    # Whether a search has run on the current watches, and a copy of them as built (see _fresh_watches)
+    _watches_used: bool = field(default=False, init=False, repr=False, compare=False)
+    _initial_watches: Optional[Tuple] = field(default=None, init=False, repr=False, compare=False)
+    _arrays: Optional[Tuple] = field(default=None, init=False, repr=False, compare=False)
+    # Memoized UNSAT checks of this CNF or subsets of its clauses (see check_unsat_under_assumptions):
+    # (clause-id set, assumption set) -> is_unsat, and per assumption set the
+    # (minimal known UNSAT, maximal known SAT) clause-id sets
+    _unsat_cache: Dict[Tuple[frozenset, frozenset], bool] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _unsat_bounds: Dict[frozenset, Tuple[List[frozenset], List[frozenset]]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    def __post_init__(self):
+        self.clauses = tuple(self.clauses)
+        _assign_clause_ids(self.clauses)
+        self._build_watches()
+
+    def _build_watches(self):
+        self.watches = {}
+        self.watch_idx = []
+        for ci, cl in enumerate(self.clauses):
+            if len(cl.lits) < 2:
+                self.watch_idx.append([])
+                continue
+            self.watch_idx.append([0, 1])
+            self.watches.setdefault(cl.lits[0], []).append(ci)
+            self.watches.setdefault(cl.lits[1], []).append(ci)
+        self._watches_used = False
+        self._initial_watches = None
+
+    def _fresh_watches(self):
+        """Undo watch moves made by earlier searches, so a new solve does not depend on them.
+
+        The copy to restore from is only taken once a CNF is solved a second time.
+        """
+        if self._watches_used:
+            if self._initial_watches is None:
+                self._build_watches()
+                self._initial_watches = ({l: ws.copy() for l, ws in self.watches.items()},
+                                         [w.copy() for w in self.watch_idx])
+            else:
+                watches, watch_idx = self._initial_watches
+                self.watches = {l: ws.copy() for l, ws in watches.items()}
+                self.watch_idx = [w.copy() for w in watch_idx]
+        self._watches_used = True
+
+    def preprocess(self):
+        """Remove clauses subsumed by another clause (C1 subsumes C2 if C1.lits is a subset of C2.lits).
+
+        Removed clauses are recorded in `subsumed_by` so an anonymous subsumer can
+        still cite their rule ids (see cited_rule_ids).
+        """
+        occ: Dict[int, Set[int]] = {}
+        for ci, cl in enumerate(self.clauses):
+            for lit in cl.lits:
+                occ.setdefault(lit, set()).add(ci)
+        removed = [False] * len(self.clauses)
+        for ci in sorted(range(len(self.clauses)), key=lambda i: len(self.clauses[i].lits)):
+            if removed[ci]:
+                continue
+            cl = self.clauses[ci]
+            if not cl.lits:
+                continue
+            # Clauses containing every literal of cl, starting from the rarest occurrence set
+            occ_sets = sorted((occ[l] for l in cl.lits), key=len)
+            for di in occ_sets[0].intersection(*occ_sets[1:]):
+                other = self.clauses[di]
+                if di == ci or (len(other.lits) == len(cl.lits) and di < ci):
+                    continue
+                removed[di] = True
+                for lit in other.lits:
+                    occ[lit].discard(di)
+                self.subsumed_by[other.clause_id] = cl
+                self._subsumed.setdefault(cl.clause_id, []).append(other)
+        kept = [cl for ci, cl in enumerate(self.clauses) if not removed[ci]]
+        self.subsumed_removed += len(self.clauses) - len(kept)
+        self.clauses = tuple(kept)
+        self._arrays = None
+        self.__dict__.pop("_var_index", None)
+        self.__dict__.pop("_clause_id_set", None)
+        self.__dict__.pop("signature", None)
+        self._build_watches()
+        return self
+
+    @cached_property
+    def signature(self) -> str:
+        """Content hash of clauses (literals, cited rule ids, notes) and rule descriptions; order-independent."""
+        h = hashlib.blake2b(digest_size=20)
+        items = sorted((cl.key, tuple(self.cited_rule_ids(cl)), cl.note) for cl in self.clauses)
+        h.update(repr(items).encode())
+        h.update(repr(sorted((rid, m.description) for rid, m in self.rules.items())).encode())
+        return h.hexdigest()
+
+    @cached_property
+    def _clause_id_set(self) -> frozenset:
+        return frozenset(cl.clause_id for cl in self.clauses)
+
+    @cached_property
+    def _var_index(self) -> Dict[int, Set[int]]:
+        """Variable -> indices of the clauses it occurs in."""
+        index: Dict[int, Set[int]] = {}
+        for ci, cl in enumerate(self.clauses):
+            for lit in cl.lits:
+                index.setdefault(abs(lit), set()).add(ci)
+        return index
+
+    def cited_rule_ids(self, cl: Clause) -> List[str]:
+        """Rule ids to report for `cl`; an anonymous clause also cites the clauses it subsumed."""
+        if cl.rule_id:
+            return [cl.rule_id]
+        return [cl.rule_id] + [c.rule_id for c in self._subsumed.get(cl.clause_id, []) if c.rule_id]
+
+    def to_arrays(self):
+        """Flat SoA clause storage: (lits_flat int32, offsets int32), clause i is lits_flat[offsets[i]:offsets[i+1]]."""
+        if self._arrays is None:
+            offsets = np.zeros(len(self.clauses) + 1, dtype=np.int32)
+            for ci, cl in enumerate(self.clauses):
+                offsets[ci + 1] = offsets[ci] + len(cl.lits)
+            lits_flat = np.fromiter((l for cl in self.clauses for l in cl.lits), dtype=np.int32, count=int(offsets[-1]))
+            self._arrays = (lits_flat, offsets)
+        return self._arrays
 
 Assignment = Dict[int, bool]
 
@@ -31,88 +226,181 @@ def lit_is_true(lit: int, assign: Assignment):
     return val if lit > 0 else (not val)
 
 def clause_status(clause: Clause, assign: Assignment):
-    """Return (is_satisfied, is_conflict, unit_lit)."""
-    trues = 0
-    unassigned = []
+    """Return (is_satisfied, is_conflict, unit_lit).
+
+    Kept as a public helper only: unit_propagate works off the watch lists and
+    does not call it. The scan stops at the first true literal.
+    """
+    first = None
+    two = False
     for lit in clause.lits:
-        val = lit_is_true(lit, assign)
-        if val is True:
-            trues += 1
-            break
-        elif val is None:
-            unassigned.append(lit)
-    if trues > 0:
+        val = assign.get(lit if lit > 0 else -lit)
+        if val is None:
+            if first is None:
+                first = lit
+            else:
+                two = True
+        elif val == (lit > 0):
+            return True, False, None
+    if first is None:
+        return False, True, None
+    return False, False, (None if two else first)
+
+def assignment_masks(assign: Assignment) -> Tuple[int, int]:
+    """(assigned_true, assigned_false) variable bitmasks of `assign`, for clause_status_masks."""
+    assigned_true = 0
+    assigned_false = 0
+    for v, val in assign.items():
+        if val:
+            assigned_true |= 1 << v
+        else:
+            assigned_false |= 1 << v
+    return assigned_true, assigned_false
+
+def clause_status_masks(clause: Clause, assigned_true: int, assigned_false: int):
+    """clause_status over variable bitmasks, with a few int ops per clause instead of a per-literal loop.
+
+    Build the masks once with assignment_masks when checking many clauses against one assignment.
+    """
+    pos_mask, neg_mask = clause.masks
+    if (pos_mask & assigned_true) | (neg_mask & assigned_false):
         return True, False, None
-    if len(unassigned) == 0:
+    unassigned = (pos_mask | neg_mask) & ~(assigned_true | assigned_false)
+    if not unassigned:
         return False, True, None
-    if len(unassigned) == 1:
-        return False, False, unassigned[0]
-    return False, False, None
-
-def unit_propagate(cnf: CNF, assign: Assignment, reasons: Dict[int, Clause]):
-    """Classic UP with reason tracking. Returns (ok, conflict_clause)."""
-    changed = True
-    while changed:
-        changed = False
+    low = unassigned & -unassigned
+    # Unit iff exactly one unassigned variable, occurring with one sign only
+    if unassigned != low or pos_mask & neg_mask & low:
+        return False, False, None
+    v = low.bit_length() - 1
+    return False, False, (v if pos_mask & low else -v)
+
+def unit_propagate(cnf: CNF, assign: Assignment, reasons: Dict[int, Clause], trail: Optional[List[int]] = None, head: int = 0):
+    """Two-watched-literal UP with reason tracking. Returns (ok, conflict_clause).
+
+    Literals in `trail[head:]` are propagated and implied literals are appended
+    to `trail`; when omitted, every literal already in `assign` is propagated
+    and unit/empty clauses are seeded.
+    """
+    if trail is None:
+        cnf._fresh_watches()
+        head = 0
+        trail = [v if val else -v for v, val in assign.items()]
         for cl in cnf.clauses:
-            sat, conflict, unit_lit = clause_status(cl, assign)
-            if sat:
+            if not cl.lits:
+                return False, cl
+            if len(cl.lits) == 1:
+                unit_lit = cl.lits[0]
+                val = lit_is_true(unit_lit, assign)
+                if val is False:
+                    return False, cl
+                if val is None:
+                    assign[abs(unit_lit)] = (unit_lit > 0)
+                    reasons[abs(unit_lit)] = cl
+                    trail.append(unit_lit)
+    watches = cnf.watches
+    while head < len(trail):
+        false_lit = -trail[head]
+        head += 1
+        watch_list = watches.get(false_lit)
+        if not watch_list:
+            continue
+        i = 0
+        while i < len(watch_list):
+            ci = watch_list[i]
+            cl = cnf.clauses[ci]
+            lits = cl.lits
+            w = cnf.watch_idx[ci]
+            # Keep the falsified watch in w[0]
+            if lits[w[0]] != false_lit:
+                w[0], w[1] = w[1], w[0]
+            other = lits[w[1]]
+            # Cached second watch: if it is true the clause is satisfied
+            other_val = assign.get(other if other > 0 else -other)
+            if other_val is not None and other_val == (other > 0):
+                i += 1
+                continue
+            # Early-exit scan for a replacement watch: stop at the first non-false literal
+            new_k = -1
+            for k, lit in enumerate(lits):
+                if k == w[0] or k == w[1]:
+                    continue
+                val = assign.get(lit if lit > 0 else -lit)
+                if val is None or val == (lit > 0):
+                    new_k = k
+                    break
+            if new_k >= 0:
+                w[0] = new_k
+                watch_list[i] = watch_list[-1]
+                watch_list.pop()
+                watches.setdefault(lits[new_k], []).append(ci)
                 continue
-            if conflict:
+            if other_val is not None:
                 return False, cl
-            if unit_lit is not None:
-                v = abs(unit_lit)
-                val = (unit_lit > 0)
-                if v in assign:
-                    if assign[v] != val:
-                        return False, cl
-                    else:
-                        continue
-                assign[v] = val
-                reasons[v] = cl
-                changed = True
+            assign[abs(other)] = (other > 0)
+            reasons[abs(other)] = cl
+            trail.append(other)
+            i += 1
     return True, None
 
 def _preferred_var_order(num_vars: int, assign: Assignment, core_hint_literals: Optional[List[int]]):
     """Prefer variables present in core_hint_literals (sign ignored)."""
     hinted = []
+    seen = set()
     if core_hint_literals:
-        seen = set()
         for l in core_hint_literals:
             v = abs(l)
             if v not in seen and v not in assign:
                 hinted.append(v)
                 seen.add(v)
-    rest = [v for v in range(1, num_vars + 1) if v not in assign and v not in hinted]
+    rest = [v for v in range(1, num_vars + 1) if v not in assign and v not in seen]
     return hinted + rest
 
+def _var_mask(lits) -> int:
+    """Bitmask with bit abs(l) set for every literal l."""
+    mask = 0
+    for l in lits:
+        mask |= 1 << abs(l)
+    return mask
+
+def _mask_to_lits(mask: int, assign: Assignment) -> List[int]:
+    """Signed literals (per assign) for the variables set in mask, in variable order."""
+    lits = []
+    while mask:
+        low = mask & -mask
+        v = low.bit_length() - 1
+        lits.append(v if assign.get(v, False) else -v)
+        mask ^= low
+    return lits
+
 def collect_assumption_causes(var: int, reasons: Dict[int, Clause], assumptions_set: Set[int], assign: Assignment):
-    """Trace reason graph from var back to assumptions; return set of signed assumption literals."""
-    frontier = [var]
-    seen_vars = set()
-    contributing_assumptions: Set[int] = set()
-    while frontier:
-        v = frontier.pop()
-        if v in seen_vars:
+    """Trace reason graph from var back to assumptions; return set of signed assumption literals.
+
+    build_explanation does this walk itself, fused with the rule walk; this stays
+    for callers tracing a single variable.
+    """
+    assumptions_mask = _var_mask(assumptions_set)
+    contributing = 0
+    visited = bytearray(max(max(assign, default=0), var) + 1)
+    stack = [var]
+    while stack:
+        v = stack.pop()
+        if visited[v]:
             continue
-        seen_vars.add(v)
-        if v not in reasons:
-            lit = v if assign.get(v, False) else -v
-            if lit in assumptions_set or -lit in assumptions_set:
-                contributing_assumptions.add(lit)
+        visited[v] = 1
+        cl = reasons.get(v)
+        if cl is None:
+            contributing |= assumptions_mask & (1 << v)
             continue
-        cl = reasons[v]
         for lit in cl.lits:
             u = abs(lit)
-            if u == v:
-                continue
-            if u in assign:
-                frontier.append(u)
-    return contributing_assumptions
+            if u != v and u in assign:
+                stack.append(u)
+    return set(_mask_to_lits(contributing, assign))
 
 def build_explanation(cnf: CNF, assign: Assignment, reasons: Dict[int, Clause], conflict_clause: Clause, assumptions: List[int]):
     """Human-usable UNSAT explanation with clause/rule mapping."""
-    assumptions_set = set(assumptions)
+    assumptions_mask = _var_mask(assumptions)
     falsified_lits = []
     for lit in conflict_clause.lits:
         v = abs(lit)
@@ -121,28 +409,31 @@ def build_explanation(cnf: CNF, assign: Assignment, reasons: Dict[int, Clause],
             is_true = val if lit > 0 else (not val)
             if not is_true:
                 falsified_lits.append(lit)
-    # Which assumptions ultimately caused those falsifications?
-    assumption_causes: Set[int] = set()
-    for lit in falsified_lits:
-        v = abs(lit)
-        assumption_causes |= collect_assumption_causes(v, reasons, assumptions_set, assign)
-    # Which rules (clauses) participated via the reason graph?
+    # One walk over the reason cone: roots give the assumptions that caused the
+    # falsifications, reason clauses give the rules that participated
+    cause_mask = 0
     involved_rules: Set[str] = set()
-    def walk_reasons(v: int, visited_vars: Set[int]):
-        if v in visited_vars:
-            return
-        visited_vars.add(v)
-        if v not in reasons:
-            return
-        cl = reasons[v]
-        involved_rules.add(cl.rule_id)
+    reason_clauses = [conflict_clause]
+    visited = bytearray(max(cnf.num_vars, max(assign, default=0)) + 1)
+    stack = [abs(lit) for lit in falsified_lits]
+    while stack:
+        v = stack.pop()
+        if visited[v]:
+            continue
+        visited[v] = 1
+        cl = reasons.get(v)
+        if cl is None:
+            if v in assign:
+                cause_mask |= assumptions_mask & (1 << v)
+            continue
+        involved_rules.update(cnf.cited_rule_ids(cl))
+        if cl is not conflict_clause:
+            reason_clauses.append(cl)
         for lit in cl.lits:
             u = abs(lit)
             if u != v:
-                walk_reasons(u, visited_vars)
-    visited = set()
-    for lit in falsified_lits:
-        walk_reasons(abs(lit), visited)
+                stack.append(u)
+    assumption_causes = _mask_to_lits(cause_mask, assign)
     rules_info = []
     for rid in sorted(involved_rules):
         meta = cnf.rules.get(rid, RuleMeta(rid, ""))
@@ -158,12 +449,20 @@ def build_explanation(cnf: CNF, assign: Assignment, reasons: Dict[int, Clause],
             "note": conflict_clause.note,
         },
         "falsified_literals": falsified_lits,
-        "assumption_causes": sorted(assumption_causes, key=lambda x: (abs(x), x)),
+        "assumption_causes": assumption_causes,
         "involved_rules": rules_info,
+        "reason_clauses": [
+            {"lits": c.lits, "rule_id": c.rule_id, "note": c.note} for c in reason_clauses
+        ],
     }
 
-def dpll_explain(cnf: CNF, assumptions: List[int], core_hint_literals: Optional[List[int]] = None):
-    """DPLL with unit prop + backtracking; enhanced with hinted decision order."""
+def dpll_explain(cnf: CNF, assumptions: List[int], core_hint_literals: Optional[List[int]] = None,
+                 order: Optional[List[int]] = None, first_value: bool = True, stop=None):
+    """DPLL with unit prop + backtracking; enhanced with hinted decision order.
+
+    `order` and `first_value` override the decision order and the polarity tried
+    first; `stop` is an Event that aborts the search, returning sat=None.
+    """
     assign: Assignment = {}
     reasons: Dict[int, Clause] = {}
     # Seed assumptions
@@ -179,76 +478,409 @@ def dpll_explain(cnf: CNF, assumptions: List[int], core_hint_literals: Optional[
     ok, confl = unit_propagate(cnf, assign, reasons)
     if not ok:
         return False, assign, build_explanation(cnf, assign, reasons, confl, assumptions)
-    # Decisions
+    # Decisions: one fixed order, with a pointer past the already-assigned prefix.
+    # Literals assigned since the first decision go on `trail` so backtracking
+    # undoes them in place instead of restoring copies.
+    if order is None:
+        order = _preferred_var_order(cnf.num_vars, {}, core_hint_literals)
+    pos = 0
+    trail: List[int] = []
     stack = []
     while True:
-        order = _preferred_var_order(cnf.num_vars, assign, core_hint_literals)
-        v = order[0] if order else None
-        if v is None:
+        if stop is not None and stop.is_set():
+            return None, assign, {"type": "cancelled"}
+        while pos < len(order) and order[pos] in assign:
+            pos += 1
+        if pos == len(order):
             return True, assign, {"type": "model"}
-        stack.append((assign.copy(), reasons.copy(), v, False))
-        assign[v] = True
-        ok, confl = unit_propagate(cnf, assign, reasons)
+        v = order[pos]
+        stack.append((len(trail), v, False, pos))
+        assign[v] = first_value
+        trail.append(v if first_value else -v)
+        ok, confl = unit_propagate(cnf, assign, reasons, trail, len(trail) - 1)
         if ok:
             continue
-        # Backtrack / try False
+        # Backtrack / try the other polarity
         while True:
             if not stack:
                 return False, assign, build_explanation(cnf, assign, reasons, confl, assumptions)
-            prev_assign, prev_reasons, v_dec, tried_neg = stack.pop()
-            assign, reasons = prev_assign, prev_reasons
+            saved_len, v_dec, tried_neg, pos = stack.pop()
+            while len(trail) > saved_len:
+                u = abs(trail.pop())
+                del assign[u]
+                reasons.pop(u, None)
             if not tried_neg:
-                stack.append((assign.copy(), reasons.copy(), v_dec, True))
-                assign[v_dec] = False
-                ok, confl = unit_propagate(cnf, assign, reasons)
+                stack.append((saved_len, v_dec, True, pos))
+                assign[v_dec] = not first_value
+                trail.append(-v_dec if first_value else v_dec)
+                ok, confl = unit_propagate(cnf, assign, reasons, trail, saved_len)
                 if ok:
                     break
                 else:
                     continue
 
-def check_unsat_under_assumptions(cnf: CNF, assumptions: List[int], core_hint_literals: Optional[List[int]] = None):
+# Set in each portfolio worker by _portfolio_init: (cnf, assumptions, core_hint_literals, stop)
+_portfolio_state = None
+
+def _portfolio_strategies(n: int):
+    """Diversified (seed, use_hints, first_value) triples; the first is plain dpll_explain."""
+    base = [(None, True, True), (None, True, False), (None, False, True), (None, False, False)]
+    extra = [(i, i % 2 == 0, i % 4 < 2) for i in range(max(0, n - len(base)))]
+    return (base + extra)[:n]
+
+def _portfolio_init(cnf: CNF, assumptions: List[int], core_hint_literals: Optional[List[int]], stop):
+    global _portfolio_state
+    _portfolio_state = (cnf, assumptions, core_hint_literals, stop)
+
+def _portfolio_worker(strategy):
+    cnf, assumptions, core_hint_literals, stop = _portfolio_state
+    seed, use_hints, first_value = strategy
+    hints = core_hint_literals if use_hints else None
+    order = _preferred_var_order(cnf.num_vars, {}, hints)
+    if seed is not None:
+        # Keep hinted vars first; permute the rest
+        n_hinted = len({abs(l) for l in hints}) if hints else 0
+        rest = order[n_hinted:]
+        random.Random(seed).shuffle(rest)
+        order[n_hinted:] = rest
+    sat, assign, info = dpll_explain(cnf, assumptions, order=order, first_value=first_value, stop=stop)
+    if sat is not None:
+        stop.set()
+    return sat, assign, info
+
+def dpll_explain_portfolio(cnf: CNF, assumptions: List[int], core_hint_literals: Optional[List[int]] = None,
+                           n_workers: Optional[int] = None):
+    """Run diversified dpll_explain strategies in forked processes; the first to finish wins.
+
+    Workers inherit the CNF through fork instead of pickling it per task. Process
+    start-up dominates on small formulas, so callers opt in explicitly; without
+    fork support (e.g. Windows) this runs plain dpll_explain.
+    """
+    n_workers = n_workers or os.cpu_count() or 1
+    try:
+        ctx = multiprocessing.get_context("fork")
+    except ValueError:
+        ctx = None
+    if ctx is None or n_workers < 2:
+        return dpll_explain(cnf, assumptions, core_hint_literals=core_hint_literals)
+    stop = ctx.Event()
+    with ProcessPoolExecutor(n_workers, mp_context=ctx, initializer=_portfolio_init,
+                             initargs=(cnf, assumptions, core_hint_literals, stop)) as pool:
+        futures = [pool.submit(_portfolio_worker, st) for st in _portfolio_strategies(n_workers)]
+        for fut in as_completed(futures):
+            sat, assign, info = fut.result()
+            if sat is not None:
+                stop.set()
+                for other in futures:
+                    other.cancel()
+                return sat, assign, info
+    raise RuntimeError("portfolio finished without a result")
+
+def _jit(fn):
+    return njit(cache=True)(fn) if njit is not None else fn
+
+@_jit
+def _lit_slot(lit):
+    # Watch-list index of a signed literal
+    return 2 * lit if lit > 0 else -2 * lit + 1
+
+@_jit
+def _lit_value(lit, assign_i8):
+    # >0 true, <0 false, 0 unassigned
+    return assign_i8[abs(lit)] * (1 if lit > 0 else -1)
+
+@_jit
+def _propagate(lits_flat, offsets, watch_pos, watches_head, watches_next, assign_i8, reasons_i32, trail, trail_head, trail_len):
+    """Array watched-literal UP. Watch slot 2*ci+j is clause ci's j-th watch. Returns (conflict_ci or -1, trail_head, trail_len)."""
+    while trail_head < trail_len:
+        false_lit = -trail[trail_head]
+        trail_head += 1
+        head = _lit_slot(false_lit)
+        prev = -1
+        s = watches_head[head]
+        while s != -1:
+            nxt = watches_next[s]
+            ci = s >> 1
+            other = lits_flat[watch_pos[s ^ 1]]
+            other_val = _lit_value(other, assign_i8)
+            if other_val > 0:
+                prev = s
+                s = nxt
+                continue
+            moved = False
+            for p in range(offsets[ci], offsets[ci + 1]):
+                if p == watch_pos[s] or p == watch_pos[s ^ 1]:
+                    continue
+                lit = lits_flat[p]
+                if _lit_value(lit, assign_i8) >= 0:
+                    if prev == -1:
+                        watches_head[head] = nxt
+                    else:
+                        watches_next[prev] = nxt
+                    watch_pos[s] = p
+                    slot = _lit_slot(lit)
+                    watches_next[s] = watches_head[slot]
+                    watches_head[slot] = s
+                    moved = True
+                    break
+            if moved:
+                s = nxt
+                continue
+            if other_val < 0:
+                return ci, trail_head, trail_len
+            v = abs(other)
+            assign_i8[v] = 1 if other > 0 else -1
+            reasons_i32[v] = ci
+            trail[trail_len] = other
+            trail_len += 1
+            prev = s
+            s = nxt
+    return -1, trail_head, trail_len
+
+@_jit
+def _solve_arrays(lits_flat, offsets, num_vars, assumptions, order):
+    """Boolean DPLL over SoA clauses with chronological backtracking; True iff SAT."""
+    n_clauses = offsets.shape[0] - 1
+    assign_i8 = np.zeros(num_vars + 1, dtype=np.int8)
+    reasons_i32 = np.full(num_vars + 1, -1, dtype=np.int32)
+    trail = np.zeros(num_vars + 1, dtype=np.int32)
+    trail_len = 0
+    watch_pos = np.zeros(2 * n_clauses, dtype=np.int32)
+    watches_head = np.full(2 * num_vars + 2, -1, dtype=np.int32)
+    watches_next = np.full(2 * n_clauses, -1, dtype=np.int32)
+    for a in assumptions:
+        val = _lit_value(a, assign_i8)
+        if val < 0:
+            return False
+        if val == 0:
+            assign_i8[abs(a)] = 1 if a > 0 else -1
+            trail[trail_len] = a
+            trail_len += 1
+    for ci in range(n_clauses):
+        start = offsets[ci]
+        size = offsets[ci + 1] - start
+        if size == 0:
+            return False
+        if size == 1:
+            lit = lits_flat[start]
+            val = _lit_value(lit, assign_i8)
+            if val < 0:
+                return False
+            if val == 0:
+                assign_i8[abs(lit)] = 1 if lit > 0 else -1
+                reasons_i32[abs(lit)] = ci
+                trail[trail_len] = lit
+                trail_len += 1
+            continue
+        for j in range(2):
+            s = 2 * ci + j
+            watch_pos[s] = start + j
+            slot = _lit_slot(lits_flat[start + j])
+            watches_next[s] = watches_head[slot]
+            watches_head[slot] = s
+    confl, trail_head, trail_len = _propagate(lits_flat, offsets, watch_pos, watches_head, watches_next, assign_i8, reasons_i32, trail, 0, trail_len)
+    if confl >= 0:
+        return False
+    # Decision stack: trail length and order position at each decision
+    saved_len = np.zeros(num_vars + 1, dtype=np.int32)
+    saved_pos = np.zeros(num_vars + 1, dtype=np.int32)
+    tried_neg = np.zeros(num_vars + 1, dtype=np.bool_)
+    level = 0
+    pos = 0
+    while True:
+        while pos < order.shape[0] and assign_i8[order[pos]] != 0:
+            pos += 1
+        if pos == order.shape[0]:
+            return True
+        v = order[pos]
+        saved_len[level] = trail_len
+        saved_pos[level] = pos
+        tried_neg[level] = False
+        level += 1
+        assign_i8[v] = 1
+        trail[trail_len] = v
+        trail_len += 1
+        confl, trail_head, trail_len = _propagate(lits_flat, offsets, watch_pos, watches_head, watches_next, assign_i8, reasons_i32, trail, trail_head, trail_len)
+        while confl >= 0:
+            # Backtrack to the most recent decision not yet flipped
+            while level > 0 and tried_neg[level - 1]:
+                level -= 1
+            if level == 0:
+                return False
+            while trail_len > saved_len[level - 1]:
+                trail_len -= 1
+                u = abs(trail[trail_len])
+                assign_i8[u] = 0
+                reasons_i32[u] = -1
+            tried_neg[level - 1] = True
+            pos = saved_pos[level - 1]
+            v = order[pos]
+            assign_i8[v] = -1
+            trail[trail_len] = -v
+            trail_head = trail_len
+            trail_len += 1
+            confl, trail_head, trail_len = _propagate(lits_flat, offsets, watch_pos, watches_head, watches_next, assign_i8, reasons_i32, trail, trail_head, trail_len)
+
+def clear_unsat_cache(cnf: CNF):
+    cnf._unsat_cache.clear()
+    cnf._unsat_bounds.clear()
+
+def check_unsat_under_assumptions(cnf: CNF, assumptions: List[int], core_hint_literals: Optional[List[int]] = None,
+                                  portfolio: bool = False, clauses: Optional[List[Clause]] = None):
+    """UNSAT check memoized on `cnf`; hints only steer the search, so they are not part of the key.
+
+    `clauses` checks that subset of cnf's clauses instead; a CNF over it is only
+    built on a cache miss. `portfolio=True` solves cache misses with
+    dpll_explain_portfolio, which pays off on hard formulas only.
+    """
+    if clauses is None:
+        ids = cnf._clause_id_set
+    else:
+        # Clauses never put in a CNF still have id -1 and would share memo keys
+        _assign_clause_ids(clauses)
+        ids = frozenset(cl.clause_id for cl in clauses)
+    asm = frozenset(assumptions)
+    key = (ids, asm)
+    hit = cnf._unsat_cache.get(key)
+    if hit is not None:
+        return hit
+    unsat_sets, sat_sets = cnf._unsat_bounds.setdefault(asm, ([], []))
+    # Monotonicity: supersets of an UNSAT set are UNSAT, subsets of a SAT set are SAT
+    if any(u <= ids for u in unsat_sets):
+        result = True
+    elif any(ids <= t for t in sat_sets):
+        result = False
+    else:
+        target = cnf if clauses is None else CNF(cnf.num_vars, clauses, cnf.rules)
+        result = _solve_unsat(target, assumptions, core_hint_literals, portfolio)
+        if result:
+            unsat_sets[:] = [u for u in unsat_sets if not ids <= u]
+            unsat_sets.append(ids)
+        else:
+            sat_sets[:] = [t for t in sat_sets if not t <= ids]
+            sat_sets.append(ids)
+    cnf._unsat_cache[key] = result
+    return result
+
+def _solve_unsat(cnf: CNF, assumptions: List[int], core_hint_literals: Optional[List[int]] = None,
+                 portfolio: bool = False):
+    if portfolio:
+        sat, _, _ = dpll_explain_portfolio(cnf, assumptions, core_hint_literals=core_hint_literals)
+        return not sat
+    if njit is not None:
+        lits_flat, offsets = cnf.to_arrays()
+        # The njit code has no bounds checks: size from every variable the arrays can see,
+        # including clause literals above a too-small cnf.num_vars
+        num_vars = max([cnf.num_vars, int(np.abs(lits_flat).max()) if lits_flat.size else 0]
+                       + [abs(l) for l in assumptions] + [abs(l) for l in core_hint_literals or []])
+        order = np.array(_preferred_var_order(num_vars, {}, core_hint_literals), dtype=np.int32)
+        return not _solve_arrays(lits_flat, offsets, num_vars, np.array(assumptions, dtype=np.int32), order)
     sat, _, _ = dpll_explain(cnf, assumptions, core_hint_literals=core_hint_literals)
     return not sat
 
 def _clauses_with_hint_vars(cnf: CNF, core_hint_literals: List[int]):
     if not core_hint_literals:
         return []
-    hint_vars = {abs(l) for l in core_hint_literals}
-    return [c for c in cnf.clauses if any(abs(l) in hint_vars for l in c.lits)]
+    idxs: Set[int] = set()
+    for l in core_hint_literals:
+        idxs |= cnf._var_index.get(abs(l), set())
+    return [cnf.clauses[i] for i in sorted(idxs)]
 
-def mus_deletion_based(cnf: CNF, assumptions: List[int], core_hint_literals: Optional[List[int]] = None):
-    """Greedy subset-minimal UNSAT core under assumptions; focused by hint vars if provided."""
-    # Start from hinted subset if it is already UNSAT; else fall back to full CNF
-    if core_hint_literals:
-        focused = _clauses_with_hint_vars(cnf, core_hint_literals)
-        if focused:
-            test_cnf = CNF(cnf.num_vars, focused, cnf.rules)
-            if check_unsat_under_assumptions(test_cnf, assumptions, core_hint_literals=core_hint_literals):
-                core = focused
-            else:
-                core = cnf.clauses.copy()
-        else:
-            core = cnf.clauses.copy()
-    else:
-        core = cnf.clauses.copy()
-
-    i = 0
-    while i < len(core):
-        test_clauses = core[:i] + core[i+1:]
-        test_cnf = CNF(cnf.num_vars, test_clauses, cnf.rules)
-        if check_unsat_under_assumptions(test_cnf, assumptions, core_hint_literals=core_hint_literals):
-            core = test_clauses
-        else:
-            i += 1
-    return core
+def _reason_cone(cnf: CNF, info: Optional[dict]):
+    """Clauses of `cnf` listed in the reason_clauses of a prior UNSAT explanation."""
+    if not info or not info.get("reason_clauses"):
+        return []
+    wanted = {tuple(c["lits"]) for c in info["reason_clauses"]}
+    return [c for c in cnf.clauses if c.key in wanted]
 
-def explain_with_mus(cnf: CNF, assumptions: List[int], core_hint_literals: Optional[List[int]] = None):
-    """Top-level API: SAT model or UNSAT explanation + (subset-minimal) MUS."""
-    sat, assign, info = dpll_explain(cnf, assumptions, core_hint_literals=core_hint_literals)
-    if sat:
-        return {"type": "sat", "model": assign, "note": "SAT under assumptions; no conflict to explain."}
-    core = mus_deletion_based(cnf, assumptions, core_hint_literals=core_hint_literals)
-    core_rules = sorted(set(c.rule_id for c in core if c.rule_id))
+def _initial_core(cnf: CNF, assumptions: List[int], core_hint_literals: Optional[List[int]] = None, info: Optional[dict] = None):
+    """Start from the prior conflict's reason cone, else the hinted subset, whichever is UNSAT first; else the full CNF."""
+    for candidate in (_reason_cone(cnf, info), _clauses_with_hint_vars(cnf, core_hint_literals)):
+        if candidate and check_unsat_under_assumptions(cnf, assumptions, core_hint_literals=core_hint_literals, clauses=candidate):
+            return candidate
+    return list(cnf.clauses)
+
+def mus_deletion_based(cnf: CNF, assumptions: List[int], core_hint_literals: Optional[List[int]] = None, info: Optional[dict] = None):
+    """Greedy subset-minimal UNSAT core under assumptions; focused by the reason cone in `info`
+    (an UNSAT explanation from dpll_explain) or by hint vars if provided.
+
+    Each core clause C_i is extended with a fresh selector literal -s_i, so one CNF
+    serves every deletion test: C_i is enabled by assuming s_i and deleted by assuming -s_i.
+    """
+    core = _initial_core(cnf, assumptions, core_hint_literals, info)
+    base = max([cnf.num_vars] + [abs(a) for a in assumptions])
+    selectors = [base + 1 + i for i in range(len(core))]
+    sel_cnf = CNF(base + len(core), [Clause(c.lits + [-s], c.rule_id, c.note, _normalized=True) for c, s in zip(core, selectors)], cnf.rules)
+    # One assumption list for all tests; deleting C_i flips its selector in place
+    sel_assumptions = list(assumptions) + selectors
+    offset = len(assumptions)
+    for i in range(len(core)):
+        sel_assumptions[offset + i] = -selectors[i]
+        if not check_unsat_under_assumptions(sel_cnf, sel_assumptions, core_hint_literals=core_hint_literals):
+            sel_assumptions[offset + i] = selectors[i]
+    return [c for c, lit in zip(core, sel_assumptions[offset:]) if lit > 0]
+
+def quickxplain(cnf: CNF, bg: List[Clause], core: List[Clause], assumptions: List[int], core_hint_literals: Optional[List[int]] = None):
+    """Minimal subset of `core` that is UNSAT together with `bg` (QuickXplain divide-and-conquer).
+
+    Assumes bg + core is UNSAT under assumptions; returns [] if bg alone already is.
+    """
+    def is_unsat(clauses: List[Clause]):
+        return check_unsat_under_assumptions(cnf, assumptions, core_hint_literals=core_hint_literals, clauses=clauses)
+    def qx(bg: List[Clause], has_delta: bool, core: List[Clause]):
+        if has_delta and is_unsat(bg):
+            return []
+        if len(core) == 1:
+            return core
+        mid = len(core) // 2
+        c1, c2 = core[:mid], core[mid:]
+        d2 = qx(bg + c1, True, c2)
+        d1 = qx(bg + d2, bool(d2), c1)
+        return d1 + d2
+    if not core or is_unsat(bg):
+        return []
+    return qx(bg, False, core)
+
+def mus_quickxplain(cnf: CNF, assumptions: List[int], core_hint_literals: Optional[List[int]] = None, info: Optional[dict] = None):
+    """Subset-minimal UNSAT core via QuickXplain; O(k log(n/k)) UNSAT checks for a k-clause MUS."""
+    core = _initial_core(cnf, assumptions, core_hint_literals, info)
+    mus_ids = {c.clause_id for c in quickxplain(cnf, [], core, assumptions, core_hint_literals)}
+    # Keep the input order for stable output
+    return [c for c in core if c.clause_id in mus_ids]
+
+# Bump when solver changes can alter reports, so stale cache entries are never hit
+_REPORT_CACHE_VERSION = 1
+REPORT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "sat_explainer")
+
+def _report_cache_key(cnf: CNF, assumptions: List[int], core_hint_literals: Optional[List[int]]):
+    # num_vars is not implied by the clauses (load_dimacs counts dropped ones) and bounds the SAT model
+    # Assumption and hint order steers the search and so the report; keep it in the key
+    payload = repr((_REPORT_CACHE_VERSION, cnf.signature, cnf.num_vars, tuple(assumptions), tuple(core_hint_literals or ())))
+    return hashlib.blake2b(payload.encode(), digest_size=20).hexdigest()
+
+def _report_cache_get(key: str) -> Optional[dict]:
+    try:
+        with sqlite3.connect(os.path.join(REPORT_CACHE_DIR, "reports.sqlite")) as db:
+            db.execute("CREATE TABLE IF NOT EXISTS reports (key TEXT PRIMARY KEY, payload TEXT)")
+            row = db.execute("SELECT payload FROM reports WHERE key = ?", (key,)).fetchone()
+    except (sqlite3.Error, OSError):
+        return None
+    return json.loads(row[0]) if row else None
+
+def _report_cache_put(key: str, payload: dict):
+    try:
+        os.makedirs(REPORT_CACHE_DIR, exist_ok=True)
+        with sqlite3.connect(os.path.join(REPORT_CACHE_DIR, "reports.sqlite")) as db:
+            db.execute("CREATE TABLE IF NOT EXISTS reports (key TEXT PRIMARY KEY, payload TEXT)")
+            db.execute("INSERT OR REPLACE INTO reports VALUES (?, ?)", (key, json.dumps(payload)))
+    except (sqlite3.Error, OSError):
+        pass
+
+def _sat_report(assign: Assignment):
+    return {"type": "sat", "model": assign, "note": "SAT under assumptions; no conflict to explain."}
+
+def _unsat_report(cnf: CNF, info: dict, core: List[Clause], core_hint_literals: Optional[List[int]]):
+    core_rules = sorted(set(rid for c in core for rid in cnf.cited_rule_ids(c) if rid))
     return {
         "type": "unsat_with_core",
         "primary_explanation": info,
@@ -263,20 +895,90 @@ def explain_with_mus(cnf: CNF, assumptions: List[int], core_hint_literals: Optio
         "hints_used": list(core_hint_literals) if core_hint_literals else []
     }
 
-def load_dimacs(path: str) -> CNF:
-    """Load plain DIMACS CNF (no metadata)."""
+def explain_with_mus(cnf: CNF, assumptions: List[int], core_hint_literals: Optional[List[int]] = None,
+                     persistent_cache: bool = False):
+    """Top-level API: SAT model or UNSAT explanation + (subset-minimal) MUS.
+
+    With `persistent_cache`, results are stored in REPORT_CACHE_DIR keyed by
+    CNF.signature, assumptions and hints, and later calls rebuild the report
+    from the stored entry without running DPLL or MUS shrinking.
+    """
+    key = _report_cache_key(cnf, assumptions, core_hint_literals) if persistent_cache else None
+    if key is not None:
+        hit = _report_cache_get(key)
+        if hit is not None:
+            if hit["sat"]:
+                return _sat_report({v: val for v, val in hit["model"]})
+            by_key = {c.key: c for c in cnf.clauses}
+            core = [by_key[tuple(lits)] for lits in hit["mus_keys"]]
+            return _unsat_report(cnf, hit["primary_explanation"], core, core_hint_literals)
+    sat, assign, info = dpll_explain(cnf, assumptions, core_hint_literals=core_hint_literals)
+    if sat:
+        if key is not None:
+            _report_cache_put(key, {"sat": True, "model": list(assign.items())})
+        return _sat_report(assign)
+    core = mus_quickxplain(cnf, assumptions, core_hint_literals=core_hint_literals, info=info)
+    if key is not None:
+        _report_cache_put(key, {"sat": False, "primary_explanation": info, "mus_keys": [c.key for c in core]})
+    return _unsat_report(cnf, info, core, core_hint_literals)
+
+# Comment and problem lines, stripped before tokenizing
+_DIMACS_SKIP = re.compile(rb"^[ \t]*[cp][^\n]*", re.MULTILINE)
+
+def _cnf_from_lit_lists(lit_lists, max_var: int) -> CNF:
+    """Build a CNF from raw literal lists, dropping duplicate, tautological and subsumed clauses."""
     clauses: List[Clause] = []
-    max_var = 0
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f:
-            s = line.strip()
-            if not s or s.startswith("c") or s.startswith("p"):
-                continue
-            lits = [int(x) for x in s.split() if x]
-            if lits and lits[-1] == 0:
-                lits = lits[:-1]
-            for l in lits:
-                max_var = max(max_var, abs(l))
-            if lits:
-                clauses.append(Clause(lits=lits))
-    return CNF(num_vars=max_var, clauses=clauses, rules={})
+    seen: Set[Tuple[int, ...]] = set()
+    duplicates = 0
+    tautologies = 0
+    for lits in lit_lists:
+        if not lits:
+            continue
+        cl = Clause(lits=lits)
+        if cl.is_tautology:
+            tautologies += 1
+        elif cl.key in seen:
+            duplicates += 1
+        else:
+            seen.add(cl.key)
+            clauses.append(cl)
+    cnf = CNF(num_vars=max_var, clauses=clauses, rules={},
+              duplicates_removed=duplicates, tautologies_removed=tautologies)
+    return cnf.preprocess()
+
+def load_dimacs(path: str) -> CNF:
+    """Load plain DIMACS CNF (no metadata); duplicate, tautological and subsumed clauses are dropped.
+
+    The file is mmapped and parsed into one flat list of ints (in C via numpy when
+    available); clauses are the runs between 0 terminators, plus a final
+    unterminated run.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return _cnf_from_lit_lists([], 0)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            data = _DIMACS_SKIP.sub(b"", buf)
+    if np is not None:
+        flat_np = np.fromstring(data, dtype=np.int32, sep=" ")
+        flat = flat_np.tolist()
+        ends = np.flatnonzero(flat_np == 0).tolist()
+    else:
+        flat = list(map(int, data.split()))
+        ends = [i for i, l in enumerate(flat) if l == 0]
+    if not flat:
+        return _cnf_from_lit_lists([], 0)
+    max_var = max(max(flat), -min(flat))
+    lit_lists = []
+    start = 0
+    for end in ends:
+        lit_lists.append(flat[start:end])
+        start = end + 1
+    lit_lists.append(flat[start:])
+    return _cnf_from_lit_lists(lit_lists, max_var)
+
+def load_dimacs_pysat(path: str) -> CNF:
+    """Like load_dimacs, but parses with python-sat's C-backed reader (requires the `python-sat` package)."""
+    from pysat.formula import CNF as PySatCNF
+    formula = PySatCNF(from_file=path)
+    max_var = max([formula.nv] + [abs(l) for c in formula.clauses for l in c])
+    return _cnf_from_lit_lists(formula.clauses, max_var)
@@ -0,0 +1,230 @@
+import itertools
+import random
+from dataclasses import replace
+
+import pytest
+
+import sat_explainer as se
+
+
+def random_cnf(rnd: random.Random):
+    num_vars = rnd.randint(1, 6)
+    lit_lists = [[rnd.choice([-1, 1]) * rnd.randint(1, num_vars) for _ in range(rnd.randint(1, 3))]
+                 for _ in range(rnd.randint(1, 14))]
+    assumptions = [v * rnd.choice([-1, 1]) for v in rnd.sample(range(1, num_vars + 1), rnd.randint(0, min(2, num_vars)))]
+    return num_vars, lit_lists, assumptions
+
+
+def brute_force_sat(num_vars, lit_lists, assumptions):
+    for values in itertools.product([False, True], repeat=num_vars):
+        assign = dict(zip(range(1, num_vars + 1), values))
+        if all(assign[abs(a)] == (a > 0) for a in assumptions) and \
+                all(any(assign[abs(l)] == (l > 0) for l in lits) for lits in lit_lists):
+            return True
+    return False
+
+
+def cases(n, seed=0):
+    rnd = random.Random(seed)
+    return [random_cnf(rnd) for _ in range(n)]
+
+
+def unsat_cases(n, seed=0):
+    return [c for c in cases(n, seed) if not brute_force_sat(*c)]
+
+
+@pytest.mark.parametrize("num_vars, lit_lists, assumptions", cases(300))
+def test_dpll_explain_matches_brute_force(num_vars, lit_lists, assumptions):
+    cnf = se.CNF(num_vars, [se.Clause(lits) for lits in lit_lists])
+    sat, assign, info = se.dpll_explain(cnf, assumptions)
+    assert sat == brute_force_sat(num_vars, lit_lists, assumptions)
+    if sat:
+        assert all(assign[abs(a)] == (a > 0) for a in assumptions)
+        assert all(any(assign.get(abs(l)) == (l > 0) for l in lits) for lits in lit_lists)
+    elif info["type"] == "unsat_explanation":
+        assert info["reason_clauses"][0] == info["conflict_clause"]
+
+
+@pytest.mark.skipif(se.njit is None, reason="needs numba")
+@pytest.mark.parametrize("num_vars, lit_lists, assumptions", cases(300, seed=1))
+def test_solve_arrays_matches_brute_force(num_vars, lit_lists, assumptions):
+    np = se.np
+    cnf = se.CNF(num_vars, [se.Clause(lits) for lits in lit_lists])
+    lits_flat, offsets = cnf.to_arrays()
+    order = np.arange(1, num_vars + 1, dtype=np.int32)
+    sat = se._solve_arrays(lits_flat, offsets, num_vars, np.array(assumptions, dtype=np.int32), order)
+    assert sat == brute_force_sat(num_vars, lit_lists, assumptions)
+
+
+@pytest.mark.parametrize("mus", [se.mus_deletion_based, se.mus_quickxplain])
+@pytest.mark.parametrize("num_vars, lit_lists, assumptions", unsat_cases(300, seed=2))
+def test_mus_is_subset_minimal(mus, num_vars, lit_lists, assumptions):
+    cnf = se.CNF(num_vars, [se.Clause(lits) for lits in lit_lists])
+    _, _, info = se.dpll_explain(cnf, assumptions)
+    core = [c.lits for c in mus(cnf, assumptions, info=info)]
+    assert not brute_force_sat(num_vars, core, assumptions)
+    for i in range(len(core)):
+        assert brute_force_sat(num_vars, core[:i] + core[i + 1:], assumptions)
+
+
+@pytest.mark.parametrize("num_vars, lit_lists, assumptions", cases(4, seed=3))
+def test_portfolio_matches_brute_force(num_vars, lit_lists, assumptions):
+    cnf = se.CNF(num_vars, [se.Clause(lits) for lits in lit_lists])
+    sat, _, _ = se.dpll_explain_portfolio(cnf, assumptions, n_workers=2)
+    assert sat == brute_force_sat(num_vars, lit_lists, assumptions)
+
+
+def test_report_cache_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(se, "REPORT_CACHE_DIR", str(tmp_path))
+    sat_cnf = se.CNF(3, [se.Clause([1, 2], "r1"), se.Clause([-1, 3], "r2")])
+    unsat_cnf = se.CNF(3, [se.Clause([1, 2], "r1"), se.Clause([-1], "r2"), se.Clause([-2, 3], "r3"), se.Clause([-3], "r4")])
+    fresh = [se.explain_with_mus(cnf, [], persistent_cache=True) for cnf in (sat_cnf, unsat_cnf)]
+
+    def no_solve(*args, **kwargs):
+        raise AssertionError("cache miss")
+    monkeypatch.setattr(se, "dpll_explain", no_solve)
+    cached = [se.explain_with_mus(cnf, [], persistent_cache=True) for cnf in (sat_cnf, unsat_cnf)]
+    assert cached == fresh
+    assert fresh[1]["mus_size"] == 4
+    # Same clauses over more variables must not reuse the stored model
+    with pytest.raises(AssertionError):
+        se.explain_with_mus(se.CNF(4, sat_cnf.clauses), [], persistent_cache=True)
+
+
+def test_unsat_memo_ignores_replaced_clause_ids():
+    b = se.Clause([-1])
+    assert se.check_unsat_under_assumptions(se.CNF(2, [se.Clause([1]), b]), [])
+    assert not se.check_unsat_under_assumptions(se.CNF(2, [se.Clause([1]), replace(b, lits=[2])]), [])
+
+
+def test_cnf_equality_ignores_solver_state(tmp_path):
+    a = se.CNF(2, [se.Clause([1, 2]), se.Clause([-1])])
+    b = se.CNF(2, [se.Clause([1, 2]), se.Clause([-1])])
+    se.dpll_explain(a, [])
+    if se.np is not None:
+        a.to_arrays()
+        b.to_arrays()
+    assert a == b
+    # subsumed_by / _subsumed are keyed by process-global clause ids
+    path = tmp_path / "sub.cnf"
+    path.write_text("1 0\n1 2 0\n-2 3 0\n")
+    a, b = se.load_dimacs(str(path)), se.load_dimacs(str(path))
+    assert a.subsumed_removed == 1
+    assert a == b
+
+
+def test_collect_assumption_causes_takes_a_set():
+    reasons = {2: se.Clause([-1, 2])}
+    assert se.collect_assumption_causes(2, reasons, {1, 5}, {1: True, 2: True}) == {1}
+
+
+@pytest.mark.parametrize("num_vars, lit_lists, assumptions", cases(200, seed=4))
+def test_clause_status_masks_matches_clause_status(num_vars, lit_lists, assumptions):
+    assign = {abs(a): a > 0 for a in assumptions}
+    masks = se.assignment_masks(assign)
+    for lits in lit_lists:
+        cl = se.Clause(lits)
+        assert se.clause_status_masks(cl, *masks) == se.clause_status(cl, assign)
+
+
+def test_load_dimacs(tmp_path):
+    path = tmp_path / "t.cnf"
+    path.write_text("c comment 1 2 3\n  c indented 5\np cnf 6 5\n1 -2\n 0 3 4 0\n-5 0\n3 4 1 0\n6 -6 0\n2 3")
+    cnf = se.load_dimacs(str(path))
+    assert [c.lits for c in cnf.clauses] == [[1, -2], [3, 4], [-5], [2, 3]]
+    assert (cnf.num_vars, cnf.tautologies_removed, cnf.subsumed_removed) == (6, 1, 1)
+    path.write_text("")
+    assert se.load_dimacs(str(path)).clauses == ()
+
+
+def test_cnf_clauses_cannot_change_under_the_solver():
+    cnf = se.CNF(2, [se.Clause([1, 2])])
+    with pytest.raises(AttributeError):
+        cnf.clauses.append(se.Clause([-1, 2]))
+    unsat = se.CNF(2, list(cnf.clauses) + [se.Clause(l) for l in ([-1, 2], [-2, 1], [-1, -2])])
+    assert se.dpll_explain(unsat, [])[0] is False
+
+
+@pytest.mark.skipif(se.njit is None, reason="needs numba")
+@pytest.mark.parametrize("num_vars, lit_lists, assumptions", cases(100, seed=5))
+def test_array_solver_handles_understated_num_vars(num_vars, lit_lists, assumptions):
+    # Shift every variable above the declared num_vars of 1
+    shifted = [[l + 1 if l > 0 else l - 1 for l in lits] for lits in lit_lists]
+    shifted_asm = [a + 1 if a > 0 else a - 1 for a in assumptions]
+    cnf = se.CNF(1, [se.Clause(lits) for lits in shifted])
+    assert se.check_unsat_under_assumptions(cnf, shifted_asm) == (not brute_force_sat(num_vars + 1, shifted, shifted_asm))
+
+
+def test_load_dimacs_drops_duplicates(tmp_path):
+    path = tmp_path / "dup.cnf"
+    path.write_text("1 2 0\n2 1 0\n1 2 2 0\n-3 0\n-3 0\n")
+    cnf = se.load_dimacs(str(path))
+    assert [c.lits for c in cnf.clauses] == [[1, 2], [-3]]
+    assert (cnf.duplicates_removed, cnf.tautologies_removed, cnf.subsumed_removed) == (3, 0, 0)
+
+
+def test_anonymous_subsumer_cites_subsumed_rules():
+    subsumer = se.Clause([1])
+    named = se.Clause([1, 2], "r_named")
+    kept = se.Clause([-1, 3], "r_kept")
+    cnf = se.CNF(3, [named, subsumer, kept, se.Clause([1, 3])]).preprocess()
+    assert cnf.clauses == (subsumer, kept)
+    assert cnf.subsumed_by[named.clause_id] is subsumer
+    assert cnf.cited_rule_ids(subsumer) == ["", "r_named"]
+    assert cnf.cited_rule_ids(kept) == ["r_kept"]
+    report = se.explain_with_mus(cnf, [-1])
+    assert [r["rule_id"] for r in report["mus_rules"]] == ["r_named"]
+
+
+def test_initial_core_falls_back_from_reason_cone_to_hints_to_full_cnf():
+    clauses = [se.Clause(l) for l in ([1], [-1], [2], [-2], [3, 4])]
+    cnf = se.CNF(4, clauses)
+
+    def info(*lit_lists):
+        return {"reason_clauses": [{"lits": l} for l in lit_lists]}
+    # UNSAT reason cone is used as is
+    assert se._initial_core(cnf, [], [2], info([1], [-1])) == clauses[:2]
+    # SAT cone: the clauses over hinted variables, if UNSAT
+    assert se._initial_core(cnf, [], [2], info([1])) == clauses[2:4]
+    assert se._initial_core(cnf, [], [2], None) == clauses[2:4]
+    # SAT cone and SAT hinted subset: the whole CNF
+    assert se._initial_core(cnf, [], [3], info([1])) == clauses
+    assert se._initial_core(cnf, [], None, None) == clauses
+
+
+def test_var_index_maps_variables_to_clause_positions():
+    cnf = se.CNF(4, [se.Clause([1, -2]), se.Clause([2, 3]), se.Clause([-1, -3])])
+    assert cnf._var_index == {1: {0, 2}, 2: {0, 1}, 3: {1, 2}}
+    assert se._clauses_with_hint_vars(cnf, [-2]) == list(cnf.clauses[:2])
+    assert se._clauses_with_hint_vars(cnf, [4]) == []
+    # preprocess() drops the index built over the old clause positions
+    cnf = se.CNF(3, [se.Clause([1, 2]), se.Clause([1]), se.Clause([2, 3])])
+    assert cnf._var_index[2] == {0, 2}
+    assert cnf.preprocess()._var_index == {1: {0}, 2: {1}, 3: {1}}
+
+
+def test_unsat_memo_assigns_ids_to_loose_clauses():
+    host = se.CNF(1, [se.Clause([1])])
+    assert not se.check_unsat_under_assumptions(host, [], clauses=[se.Clause([1])])
+    assert se.check_unsat_under_assumptions(host, [], clauses=[se.Clause([1]), se.Clause([-1])])
+    core = [se.Clause([-1]), se.Clause([2]), se.Clause([1])]
+    assert se.quickxplain(host, [], core, []) == [core[0], core[2]]
+
+
+def test_repeated_solves_do_not_depend_on_earlier_searches():
+    cnf = se.load_dimacs("src/out.cnf")
+    first = se.dpll_explain(cnf, [81, 97, 15], [15])[2]
+    for asm in itertools.permutations([81, 97, 15]):
+        se.dpll_explain(cnf, list(asm), [15])
+    assert se.dpll_explain(cnf, [81, 97, 15], [15])[2] == first
+
+
+def test_report_cache_respects_assumption_order(tmp_path, monkeypatch):
+    monkeypatch.setattr(se, "REPORT_CACHE_DIR", str(tmp_path))
+    cnf = se.load_dimacs("src/out.cnf")
+    orders = list(itertools.permutations([81, 97, 15]))
+    fresh = [se.explain_with_mus(cnf, list(asm), [15]) for asm in orders]
+    assert len({repr(r) for r in fresh}) > 1
+    for asm in orders:
+        se.explain_with_mus(cnf, list(asm), [15], persistent_cache=True)
+    assert [se.explain_with_mus(cnf, list(asm), [15], persistent_cache=True) for asm in orders] == fresh